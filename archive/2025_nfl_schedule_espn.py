@@ -8,14 +8,37 @@ and saves it as an XML file.
 import requests
 import json
 import xml.etree.ElementTree as ET
-from xml.dom import minidom
 import sys
 from datetime import datetime
 import time
 import os
+import shutil
+import functools
+import glob
+import hashlib
 from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import orjson
+except ImportError:  # optional; stdlib json is used when it's not installed
+    orjson = None
+
+# Reused for every stdlib parse of the saved schedule
+_JSON_DECODER = json.JSONDecoder()
+
+@functools.lru_cache(maxsize=64)
+def _cached_exists(path):
+    """os.path.exists memoized for the duration of one run()"""
+    return os.path.exists(path)
 
 class NFLScheduleScraper:
+    # Fields compared when deciding whether a stored game needs updating
+    _KEY_FIELDS = ('name', 'short_name', 'date', 'status', 'week', 'venue', 'city', 'state')
+    _TEAM_FIELDS = ('name', 'abbreviation', 'score', 'record')
+    # Number of timestamped backups kept per output file
+    BACKUPS_TO_KEEP = 5
+
     def __init__(self):
         self.base_url = "https://sports.core.api.espn.com/v2/sports/football/leagues/nfl"
         self.site_url = "https://site.api.espn.com/apis/site/v2/sports/football/nfl"
@@ -30,6 +53,14 @@ class NFLScheduleScraper:
         self.schedule_data = []
         self.session = requests.Session()
         self.session.headers.update(self.headers)
+        self._script_dir = os.path.dirname(os.path.abspath(__file__))
+        self._stamp_run()
+
+    def _stamp_run(self):
+        """Capture the timestamps shared by everything one run writes"""
+        started = datetime.now()
+        self._run_ts = started.strftime("%Y%m%d_%H%M%S")
+        self._run_ts_iso = started.isoformat()
 
     def debug_response(self, response, description="Response"):
         """Debug helper to inspect API responses"""
@@ -643,22 +674,21 @@ class NFLScheduleScraper:
         
         return root
 
-    def prettify_xml(self, elem):
-        """Return a pretty-printed XML string"""
-        rough_string = ET.tostring(elem, 'unicode')
-        reparsed = minidom.parseString(rough_string)
-        return reparsed.toprettyxml(indent="  ")
-
     def get_script_directory(self):
         """Get the directory where this script is located"""
-        return os.path.dirname(os.path.abspath(__file__))
+        return self._script_dir
 
     def load_existing_data(self, filepath):
         """Load existing JSON data if file exists"""
-        if os.path.exists(filepath):
+        if _cached_exists(filepath):
             try:
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+                # One bulk read, then a single parse of the whole document
+                with open(filepath, 'rb') as f:
+                    raw = f.read()
+                if orjson is not None:
+                    data = orjson.loads(raw)
+                else:
+                    data = _JSON_DECODER.decode(raw.decode('utf-8'))
                 return data.get('games', [])
             except Exception as e:
                 print(f"Warning: Could not load existing data from {filepath}: {e}")
@@ -671,8 +701,9 @@ class NFLScheduleScraper:
         new_by_id = {game['id']: game for game in new_games if game.get('id')}
         
         merged_games = []
-        updated_count = 0
-        new_count = 0
+        updated_names = []
+        new_names = []
+        now_iso = datetime.now().isoformat()
         
         # Process existing games - update if we have new data
         for game_id, existing_game in existing_by_id.items():
@@ -680,10 +711,9 @@ class NFLScheduleScraper:
                 new_game = new_by_id[game_id]
                 if self.games_differ(existing_game, new_game):
                     # Update with new data but preserve any additional fields
-                    updated_game = self.merge_single_game(existing_game, new_game)
+                    updated_game = self.merge_single_game(existing_game, new_game, now_iso)
                     merged_games.append(updated_game)
-                    updated_count += 1
-                    print(f"  Updated: {updated_game.get('name', game_id)}")
+                    updated_names.append(updated_game.get('name', game_id))
                 else:
                     # No changes, keep existing
                     merged_games.append(existing_game)
@@ -695,71 +725,130 @@ class NFLScheduleScraper:
         for game_id, new_game in new_by_id.items():
             if game_id not in existing_by_id:
                 merged_games.append(new_game)
-                new_count += 1
-                print(f"  Added: {new_game.get('name', game_id)}")
+                new_names.append(new_game.get('name', game_id))
         
-        print(f"📊 Merge summary: {len(merged_games)} total games, {updated_count} updated, {new_count} new")
+        # Report changes in one write rather than one print per game
+        lines = [f"  Updated: {name}" for name in updated_names]
+        lines.extend(f"  Added: {name}" for name in new_names)
+        lines.append(f"📊 Merge summary: {len(merged_games)} total games, {len(updated_names)} updated, {len(new_names)} new")
+        sys.stdout.write("\n".join(lines) + "\n")
         return merged_games
 
+    @staticmethod
+    def _sig(record, fields=_KEY_FIELDS):
+        """Project a record onto the given fields as a comparable tuple"""
+        return tuple(record.get(k) for k in fields)
+
     def games_differ(self, game1, game2):
         """Check if two games have different data"""
         # Compare key fields that might change
-        key_fields = ['name', 'short_name', 'date', 'status', 'week', 'venue', 'city', 'state']
-        
-        for field in key_fields:
-            if game1.get(field) != game2.get(field):
-                return True
-        
-        # Compare teams data
-        teams1 = game1.get('teams', [])
-        teams2 = game2.get('teams', [])
-        
-        if len(teams1) != len(teams2):
+        if self._sig(game1) != self._sig(game2):
             return True
         
-        for i, team1 in enumerate(teams1):
-            if i < len(teams2):
-                team2 = teams2[i]
-                team_fields = ['name', 'abbreviation', 'score', 'record']
-                for field in team_fields:
-                    if team1.get(field) != team2.get(field):
-                        return True
-        
-        return False
+        # Compare teams data; list equality also covers differing team counts
+        team_fields = self._TEAM_FIELDS
+        teams1 = [self._sig(t, team_fields) for t in game1.get('teams', [])]
+        teams2 = [self._sig(t, team_fields) for t in game2.get('teams', [])]
+        return teams1 != teams2
 
-    def merge_single_game(self, existing_game, new_game):
+    @staticmethod
+    def _merge_teams(old_teams, new_teams):
+        """Merge team entries by id, updating existing entries in place"""
+        # The existing teams were loaded from disk for this run only, so they
+        # can be updated directly instead of copied first
+        existing_by_id = {t['id']: t for t in old_teams if t.get('id')}
+        merged_teams = []
+        for new_team in new_teams:
+            base = existing_by_id.get(new_team.get('id'))
+            if base is None:
+                merged_teams.append(new_team)
+            else:
+                base.update({k: v for k, v in new_team.items() if v is not None})
+                merged_teams.append(base)
+        return merged_teams
+
+    def merge_single_game(self, existing_game, new_game, now_iso=None):
         """Merge data from a single game, preferring new data but preserving existing fields"""
         merged = existing_game.copy()
         
-        # Update with new data
-        for key, value in new_game.items():
-            if value:  # Only update if new value is not empty
-                merged[key] = value
+        # Update with new data; only missing (None) values are skipped so that
+        # legitimate falsy updates like a 0 score or empty status still apply.
+        # Teams are merged separately below.
+        merged.update({k: v for k, v in new_game.items() if v is not None and k != 'teams'})
         
         # Special handling for teams - merge team data
-        if 'teams' in new_game and new_game['teams']:
-            existing_teams = {team.get('id'): team for team in existing_game.get('teams', [])}
-            merged_teams = []
-            
-            for new_team in new_game['teams']:
-                team_id = new_team.get('id')
-                if team_id in existing_teams:
-                    # Merge team data
-                    merged_team = existing_teams[team_id].copy()
-                    for key, value in new_team.items():
-                        if value:
-                            merged_team[key] = value
-                    merged_teams.append(merged_team)
-                else:
-                    merged_teams.append(new_team)
-            
-            merged['teams'] = merged_teams
+        if new_game.get('teams'):
+            merged['teams'] = self._merge_teams(existing_game.get('teams', []), new_game['teams'])
         
         # Update last_updated timestamp
-        merged['last_updated'] = datetime.now().isoformat()
+        merged['last_updated'] = now_iso or datetime.now().isoformat()
         
         return merged
 
+    def _backup(self, full_path):
+        """Snapshot full_path as <name>_backup_<run timestamp><ext> and prune old ones"""
+        if not _cached_exists(full_path):
+            return None
+        
+        base, ext = os.path.splitext(full_path)
+        backup_path = f"{base}_backup_{self._run_ts}{ext}"
+        try:
+            # A hardlink is instant and copies no data; fall back to a real copy
+            # across filesystems or where links aren't supported
+            try:
+                os.link(full_path, backup_path)
+            except OSError:
+                shutil.copyfile(full_path, backup_path)
+                shutil.copystat(full_path, backup_path)
+            print(f"📦 Backup created: {os.path.basename(backup_path)}")
+        except Exception as e:
+            print(f"Warning: Could not create backup of {os.path.basename(full_path)}: {e}")
+            return None
+        
+        self.prune_backups(full_path)
+        return backup_path
+
+    def prune_backups(self, full_path):
+        """Remove all but the newest BACKUPS_TO_KEEP backups of a file"""
+        base, ext = os.path.splitext(full_path)
+        # Timestamps are YYYYMMDD_HHMMSS, so lexical order is chronological
+        backups = sorted(glob.glob(f"{glob.escape(base)}_backup_*{ext}"))
+        for old_backup in backups[:-self.BACKUPS_TO_KEEP]:
+            try:
+                os.remove(old_backup)
+                print(f"🗑️ Removed old backup: {os.path.basename(old_backup)}")
+            except OSError as e:
+                print(f"Warning: Could not remove old backup {old_backup}: {e}")
+
+    def games_signature(self, games):
+        """Return a content hash of the games list for change detection"""
+        payload = json.dumps(games, sort_keys=True, ensure_ascii=False).encode('utf-8')
+        return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+    def signature_matches(self, full_path, sig):
+        """True if full_path is still the exact file written with content hash sig.
+        
+        The .sig sidecar records the file's size and mtime next to the hash, so a
+        file that was truncated, corrupted or replaced since never matches.
+        """
+        try:
+            with open(full_path + '.sig', 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+            st = os.stat(full_path)
+        except (OSError, ValueError):
+            return False
+        return (isinstance(stored, dict) and stored.get('sig') == sig
+                and stored.get('size') == st.st_size and stored.get('mtime_ns') == st.st_mtime_ns)
+
+    def write_signature(self, full_path, sig):
+        """Atomically record sig for the file just written at full_path"""
+        st = os.stat(full_path)
+        sig_path = full_path + '.sig'
+        tmp_path = sig_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'sig': sig, 'size': st.st_size, 'mtime_ns': st.st_mtime_ns}, f)
+        os.replace(tmp_path, sig_path)
+
     def save_json(self, data, filename=None):
         """Save JSON data with merge capability"""
         script_dir = self.get_script_directory()
@@ -770,10 +859,14 @@ class NFLScheduleScraper:
         filename = os.path.basename(filename)
         full_path = os.path.join(script_dir, filename)
         
-        # Load existing data and merge
-        existing_games = self.load_existing_data(full_path)
         new_games = data.get('games', [])
         
+        # First run (or an empty file): nothing to load or merge against
+        if not _cached_exists(full_path) or os.path.getsize(full_path) == 0:
+            existing_games = []
+        else:
+            existing_games = self.load_existing_data(full_path)
+        
         if existing_games:
             print(f"📋 Found existing file with {len(existing_games)} games")
             print("🔄 Merging with new data...")
@@ -782,25 +875,32 @@ class NFLScheduleScraper:
             print("📄 Creating new file")
             merged_games = new_games
         
+        # Nothing changed since the last save: skip both the backup and the rewrite.
+        # Only when the file really loaded; an empty or unreadable one is rewritten
+        sig = self.games_signature(merged_games)
+        if existing_games and self.signature_matches(full_path, sig):
+            print("✨ No changes since last run, keeping existing file")
+            return full_path
+        
         # Update metadata
         final_data = data.copy()
         final_data['games'] = merged_games
         final_data['metadata']['total_games'] = len(merged_games)
-        final_data['metadata']['last_updated'] = datetime.now().isoformat()
+        final_data['metadata']['last_updated'] = self._run_ts_iso
         
         # Create backup of existing file if it exists
-        if os.path.exists(full_path):
-            backup_path = full_path.replace('.json', f'_backup_{datetime.now().strftime("%Y%m%d_%H%M%S")}.json')
-            try:
-                import shutil
-                shutil.copy2(full_path, backup_path)
-                print(f"📦 Backup created: {os.path.basename(backup_path)}")
-            except Exception as e:
-                print(f"Warning: Could not create backup: {e}")
-        
-        # Save merged data
-        with open(full_path, 'w', encoding='utf-8') as f:
-            json.dump(final_data, f, indent=2, ensure_ascii=False)
+        self._backup(full_path)
+        
+        # Save merged data atomically: write a temp file in large chunks, flush it
+        # to disk, then swap it in (the backup may be a hardlink, never truncate)
+        payload = json.dumps(final_data, indent=2, ensure_ascii=False).encode('utf-8')
+        tmp_path = full_path + '.tmp'
+        with open(tmp_path, 'wb', buffering=1 << 20) as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, full_path)
+        self.write_signature(full_path, sig)
         
         print(f"JSON file saved as: {full_path}")
         return full_path
@@ -815,26 +915,37 @@ class NFLScheduleScraper:
         filename = os.path.basename(filename)
         full_path = os.path.join(script_dir, filename)
         
+        # Same games as the file on disk: don't rotate an identical backup in
+        sig = self.games_signature(games_data) if games_data is not None else None
+        if sig is not None and _cached_exists(full_path) and self.signature_matches(full_path, sig):
+            print("✨ No changes since last run, keeping existing XML file")
+            return full_path
+        
         # Create backup of existing file if it exists
-        if os.path.exists(full_path):
-            backup_path = full_path.replace('.xml', f'_backup_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xml')
-            try:
-                import shutil
-                shutil.copy2(full_path, backup_path)
-                print(f"📦 XML backup created: {os.path.basename(backup_path)}")
-            except Exception as e:
-                print(f"Warning: Could not create XML backup: {e}")
+        self._backup(full_path)
         
-        xml_string = self.prettify_xml(xml_root)
+        # Indent in place and serialize straight from the tree (Python 3.9+)
+        try:
+            ET.indent(xml_root, space="  ")
+        except Exception:
+            pass
         
-        with open(full_path, 'w', encoding='utf-8') as f:
-            f.write(xml_string)
+        # Replace rather than truncate, the backup may be a hardlink
+        tmp_path = full_path + '.tmp'
+        ET.ElementTree(xml_root).write(tmp_path, encoding='utf-8', xml_declaration=True)
+        os.replace(tmp_path, full_path)
+        if sig is not None:
+            self.write_signature(full_path, sig)
         
         print(f"XML file saved as: {full_path}")
         return full_path
 
     def run(self, method='all'):
         """Main execution method"""
+        # Existence probes are only valid for the run that made them
+        _cached_exists.cache_clear()
+        self._stamp_run()
+
         print("=" * 60)
         print("ESPN NFL 2025 Schedule Scraper (Enhanced Debug Version)")
         print("=" * 60)
@@ -886,17 +997,22 @@ class NFLScheduleScraper:
             script_dir = self.get_script_directory()
             raw_filename = "2025_nfl_schedule_raw_debug.json"
             raw_full_path = os.path.join(script_dir, raw_filename)
-            with open(raw_full_path, 'w') as f:
-                json.dump(events, f, indent=2)
+            with open(raw_full_path, 'wb', buffering=1 << 18) as f:
+                if orjson is not None:
+                    f.write(orjson.dumps(events, option=orjson.OPT_INDENT_2))
+                else:
+                    # Compact output; indent=2 roughly doubles the stdlib cost
+                    f.write(json.dumps(events).encode('utf-8'))
             print(f"Raw data saved to: {raw_full_path}")
             
             return False
         
         print(f"✅ Processed {len(processed_games)} games")
         
-        # Save JSON backup
-        print("\nSaving JSON backup...")
-        json_file = self.save_json({
+        # Save the JSON backup and build + save the XML side by side; the two
+        # outputs are independent and neither mutates processed_games
+        print("\nSaving JSON backup and converting to XML...")
+        json_data = {
             'metadata': {
                 'season': 2025,
                 'season_type': 'Regular Season',
@@ -904,15 +1020,14 @@ class NFLScheduleScraper:
                 'generated_date': datetime.now().isoformat()
             },
             'games': processed_games
-        })
-        
-        # Convert to XML (use merged data for XML too)
-        print("\nConverting to XML...")
-        xml_root = self.convert_to_xml(processed_games)
-        
-        # Save XML file
-        print("\nSaving XML file...")
-        xml_file = self.save_xml(xml_root, games_data=processed_games)
+        }
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            fut_json = pool.submit(self.save_json, json_data)
+            fut_xml = pool.submit(
+                lambda: self.save_xml(self.convert_to_xml(processed_games), games_data=processed_games)
+            )
+            json_file = fut_json.result()
+            xml_file = fut_xml.result()
         
         print(f"\n🎉 Success! Files created:")
         print(f"📄 XML: {xml_file}")
@@ -5,42 +5,477 @@ Fetches all 32 NFL teams data from ESPN's API and saves as XML
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from requests.utils import DEFAULT_ACCEPT_ENCODING
+from urllib3.util.retry import Retry
 import json
-import xml.etree.ElementTree as ET
-from xml.dom import minidom
+from xml.sax.saxutils import escape
 import sys
-from datetime import datetime
+from datetime import datetime, timedelta
+from email.utils import parsedate_to_datetime
 import time
 import os
+import hashlib
+import threading
+import operator
+import re
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, Future
+
+try:
+    from requests_cache import CachedSession, NEVER_EXPIRE
+except ImportError:  # optional; without it every run goes to the network
+    CachedSession = None
+
+try:
+    import orjson
+except ImportError:  # optional; falls back to the stdlib json module
+    orjson = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional; the Parquet export is skipped without it
+    pa = pq = None
+
+def _loads(raw):
+    """Parse a JSON document from bytes"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+def _to_int(value):
+    """Coerce ESPN's int-or-empty-string fields to int or None"""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+def _to_float(value):
+    """Coerce ESPN's float-or-empty-string fields to float or None"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+def _retry_after_seconds(value):
+    """Parse a Retry-After header (delta-seconds or HTTP-date) into seconds"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+class RateLimiter:
+    """Back off only when ESPN signals pressure, shared by all worker threads"""
+    def __init__(self, min_remaining=5, default_pause=1.0):
+        self.min_remaining = min_remaining
+        self.default_pause = default_pause
+        self._lock = threading.Lock()
+        self._resume_at = 0.0
+
+    def wait(self):
+        """Sleep until any pause requested by a previous response has passed"""
+        delay = self._resume_at - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+    def observe(self, response, *args, **kwargs):
+        """requests response hook: read Retry-After / X-RateLimit-Remaining"""
+        delay = _retry_after_seconds(response.headers.get('Retry-After'))
+        if delay is None and response.status_code == 429:
+            delay = self.default_pause
+        if delay is None:
+            remaining = _to_int(response.headers.get('X-RateLimit-Remaining'))
+            if remaining is not None and remaining < self.min_remaining:
+                delay = self.default_pause
+        if delay:
+            with self._lock:
+                self._resume_at = max(self._resume_at, time.monotonic() + delay)
+            print(f"    Rate limited, pausing requests for {delay:.1f}s")
+        return response
+
+# Output field -> (ESPN field, default). None as the ESPN field means the
+# value is filled in later from a $ref, so only the default is emitted.
+_TEAM_SCHEMA = [
+    ('id', 'id', ''),
+    ('guid', 'guid', ''),
+    ('uid', 'uid', ''),
+    ('name', 'name', ''),
+    ('display_name', 'displayName', ''),
+    ('short_display_name', 'shortDisplayName', ''),
+    ('nickname', 'nickname', ''),
+    ('location', 'location', ''),
+    ('abbreviation', 'abbreviation', ''),
+    ('color', 'color', ''),
+    ('alternate_color', 'alternateColor', ''),
+    ('is_active', 'isActive', True),
+    ('is_all_star', 'isAllStar', False),
+    ('logos', None, []),
+    ('record', None, {}),
+    ('venue', None, {}),
+    ('conference', None, ''),
+    ('division', None, ''),
+]
+_LOGO_SCHEMA = [
+    ('href', 'href', ''),
+    ('alt', 'alt', ''),
+    ('rel', 'rel', []),
+    ('width', 'width', ''),
+    ('height', 'height', ''),
+]
+_VENUE_SCHEMA = [
+    ('id', 'id', ''),
+    ('name', 'fullName', ''),
+    ('capacity', 'capacity', ''),
+    ('grass', 'grass', ''),
+    ('city', None, ''),
+    ('state', None, ''),
+]
+_RECORD_SCHEMA = [
+    ('wins', 'wins', 0),
+    ('losses', 'losses', 0),
+    ('ties', 'ties', 0),
+    ('percentage', 'percentage', 0.0),
+    ('summary', 'summary', ''),
+]
+
+def _compile_extractor(name, schema):
+    """Generate a function that maps one ESPN dict to our field names per schema.
+    
+    The schema is unrolled into a single dict literal so each call is just a run
+    of inlined .get()s; defaults are emitted via repr so []/{} are fresh per call.
+    """
+    items = []
+    for dst, src, default in schema:
+        if src is None:
+            items.append(f"{dst!r}: {default!r}")
+        else:
+            items.append(f"{dst!r}: d.get({src!r}, {default!r})")
+    source = f"def {name}(d):\n    return {{{', '.join(items)}}}\n"
+    namespace = {}
+    exec(source, namespace)
+    return namespace[name]
+
+_extract = _compile_extractor('_extract', _TEAM_SCHEMA)
+_extract_logo = _compile_extractor('_extract_logo', _LOGO_SCHEMA)
+_extract_venue = _compile_extractor('_extract_venue', _VENUE_SCHEMA)
+_extract_record = _compile_extractor('_extract_record', _RECORD_SCHEMA)
+
+# A group named like "AFC East" (or literally "... Division") is a division
+_DIVISION_RE = re.compile(r'\b(?:east|west|north|south|division)\b', re.I)
+# Conference buckets, in output order; anything not AFC/NFC lands in 'Other'
+_CONFERENCE_BUCKETS = ('AFC', 'NFC', 'Other')
+
+def _xml_leaf(depth, tag, text):
+    """One indented <tag>text</tag> line; empty text is written as <tag /> like ElementTree"""
+    text = '' if text is None else str(text)
+    pad = '  ' * depth
+    if not text:
+        return f"{pad}<{tag} />\n"
+    return f"{pad}<{tag}>{escape(text)}</{tag}>\n"
+
+def _team_xml(team, depth):
+    """Serialize one processed team as an indented <team> element"""
+    pad = '  ' * depth
+    inner = depth + 1
+    parts = [f"{pad}<team>\n"]
+    
+    # Basic info
+    parts.append(_xml_leaf(inner, "id", team.get('id', '')))
+    parts.append(_xml_leaf(inner, "guid", team.get('guid', '')))
+    parts.append(_xml_leaf(inner, "uid", team.get('uid', '')))
+    parts.append(_xml_leaf(inner, "name", team.get('name', '')))
+    parts.append(_xml_leaf(inner, "display_name", team.get('display_name', '')))
+    parts.append(_xml_leaf(inner, "short_display_name", team.get('short_display_name', '')))
+    parts.append(_xml_leaf(inner, "nickname", team.get('nickname', '')))
+    parts.append(_xml_leaf(inner, "location", team.get('location', '')))
+    parts.append(_xml_leaf(inner, "abbreviation", team.get('abbreviation', '')))
+    parts.append(_xml_leaf(inner, "color", team.get('color', '')))
+    parts.append(_xml_leaf(inner, "alternate_color", team.get('alternate_color', '')))
+    parts.append(_xml_leaf(inner, "is_active", str(team.get('is_active', True)).lower()))
+    parts.append(_xml_leaf(inner, "division", team.get('division', '')))
+    
+    # Logos
+    if team.get('logos'):
+        parts.append(f"{pad}  <logos>\n")
+        for logo in team['logos']:
+            parts.append(f"{pad}    <logo>\n")
+            parts.append(_xml_leaf(inner + 2, "href", logo.get('href', '')))
+            parts.append(_xml_leaf(inner + 2, "alt", logo.get('alt', '')))
+            parts.append(_xml_leaf(inner + 2, "width", logo.get('width', '')))
+            parts.append(_xml_leaf(inner + 2, "height", logo.get('height', '')))
+            if logo.get('rel'):
+                rel = ','.join(logo['rel']) if isinstance(logo['rel'], list) else str(logo['rel'])
+                parts.append(_xml_leaf(inner + 2, "rel", rel))
+            parts.append(f"{pad}    </logo>\n")
+        parts.append(f"{pad}  </logos>\n")
+    
+    # Venue
+    venue = team.get('venue', {})
+    if venue:
+        parts.append(f"{pad}  <venue>\n")
+        parts.append(_xml_leaf(inner + 1, "id", venue.get('id', '')))
+        parts.append(_xml_leaf(inner + 1, "name", venue.get('name', '')))
+        parts.append(_xml_leaf(inner + 1, "capacity", venue.get('capacity', '')))
+        parts.append(_xml_leaf(inner + 1, "grass", str(venue.get('grass', '')).lower()))
+        parts.append(_xml_leaf(inner + 1, "city", venue.get('city', '')))
+        parts.append(_xml_leaf(inner + 1, "state", venue.get('state', '')))
+        parts.append(f"{pad}  </venue>\n")
+    
+    # Record
+    record = team.get('record', {})
+    if record:
+        parts.append(f"{pad}  <record>\n")
+        parts.append(_xml_leaf(inner + 1, "wins", record.get('wins', 0)))
+        parts.append(_xml_leaf(inner + 1, "losses", record.get('losses', 0)))
+        parts.append(_xml_leaf(inner + 1, "ties", record.get('ties', 0)))
+        parts.append(_xml_leaf(inner + 1, "percentage", record.get('percentage', 0.0)))
+        parts.append(_xml_leaf(inner + 1, "summary", record.get('summary', '')))
+        parts.append(f"{pad}  </record>\n")
+    
+    parts.append(f"{pad}</team>\n")
+    return ''.join(parts)
+
+def build_conference_xml(conf_name, teams):
+    """Serialize one conference bucket as an indented <conference> fragment"""
+    parts = ["  <conference>\n",
+             _xml_leaf(2, "name", conf_name),
+             _xml_leaf(2, "team_count", len(teams))]
+    parts.extend(_team_xml(team, 2) for team in teams)
+    parts.append("  </conference>\n")
+    return ''.join(parts)
+
+def _dumps_pretty(obj):
+    """Serialize obj as indented UTF-8 JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+
+def _indent_json(raw, depth):
+    """Shift every line after the first of a pretty-printed JSON value right by depth spaces"""
+    return raw.replace(b'\n', b'\n' + b' ' * depth)
 
 class NFLTeamsScraper:
-    def __init__(self):
+    # Worker count for concurrent team fetches (and again for their $ref sub-fetches)
+    MAX_WORKERS = 16
+    # Below this many teams, spawning worker processes costs more than the
+    # serialization it offloads; the 32-team league stays in-process
+    XML_PROCESS_THRESHOLD = 2000
+    # Venue and group documents are keyed by versioned IDs and rarely change;
+    # reuse a stored copy for a week before asking ESPN again
+    REF_CACHE_TTL = 7 * 24 * 3600
+
+    def __init__(self, use_cache=True):
         self.base_url = "https://sports.core.api.espn.com/v2/sports/football/leagues/nfl"
         self.site_url = "https://site.api.espn.com/apis/site/v2/sports/football/nfl"
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36',
             'Accept': 'application/json',
             'Accept-Language': 'en-US,en;q=0.9',
+            # "gzip, deflate", plus br/zstd when urllib3 has a decoder for them
+            # (pip install brotli); never advertise what we can't decompress
+            'Accept-Encoding': DEFAULT_ACCEPT_ENCODING,
             'Referer': 'https://www.espn.com/',
+            'Connection': 'keep-alive',
             'Cache-Control': 'no-cache',
             'Pragma': 'no-cache'
         }
-        self.session = requests.Session()
+        if use_cache and CachedSession is not None:
+            self.session = self._build_cached_session()
+        else:
+            self.session = requests.Session()
         self.session.headers.update(self.headers)
+        # Both worker pools hit the same ESPN hosts; size the keep-alive pool so
+        # every worker can hold a warm connection instead of re-handshaking TLS
+        # Transient failures (429/5xx) are retried with exponential backoff,
+        # honoring Retry-After; the final response is left to raise_for_status
+        retries = Retry(total=5, backoff_factor=1, status_forcelist=(429, 500, 502, 503, 504),
+                        allowed_methods=frozenset(['GET']), respect_retry_after_header=True,
+                        raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=2 * self.MAX_WORKERS, max_retries=retries)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self._rate_limiter = RateLimiter()
+        self.session.hooks['response'].append(self._rate_limiter.observe)
+        self._ref_pool = None
+        
+        # $ref URL -> Future of its JSON, shared by every team that references it
+        self._ref_cache = {}
+        self._ref_cache_lock = threading.Lock()
+        
+        # URL -> validators + stored body for conditional GETs
+        self._etag_lock = threading.Lock()
+        self._etags_path = os.path.join(self.get_script_directory(), 'etags.json')
+        self._etag_dir = os.path.join(self.get_script_directory(), '.etag_cache')
+        self._etags = self._load_etags()
+        
+        # sha1(URL) -> JSON body of a long-lived $ref, reused without a request
+        self._ref_cache_dir = os.path.join(self.get_script_directory(), '.ref_cache')
+        # Log the negotiated Content-Encoding once, on the first fresh body
+        self._encoding_logged = False
+
+    def _build_cached_session(self):
+        """requests.Session replacement that serves repeat GETs from a local SQLite cache"""
+        # Our no-cache request headers are meant for ESPN's edge, not the local cache
+        self.headers.pop('Cache-Control', None)
+        self.headers.pop('Pragma', None)
+        
+        core_host = self.base_url.split('://', 1)[1]
+        print(f"Using HTTP cache: {os.path.join(self.get_script_directory(), 'espn_cache.sqlite')}")
+        return CachedSession(
+            os.path.join(self.get_script_directory(), 'espn_cache'),
+            backend='sqlite',
+            expire_after=timedelta(hours=6),
+            allowable_methods=('GET',),
+            urls_expire_after={
+                # Venue and conference/division descriptors don't change within a season;
+                # records (wins/losses) keep the default expiry
+                f'{core_host}/venues/*': NEVER_EXPIRE,
+                f'{core_host}/seasons/*/groups/*': NEVER_EXPIRE,
+            },
+        )
 
     def get_script_directory(self):
         """Get the directory where this script is located"""
         return os.path.dirname(os.path.abspath(__file__))
 
+    def _get(self, url, **kwargs):
+        """session.get, after waiting out any pause the rate limiter asked for"""
+        self._rate_limiter.wait()
+        return self.session.get(url, **kwargs)
+
+    def _load_etags(self):
+        """Load the stored ETag/Last-Modified validators, if any"""
+        try:
+            with open(self._etags_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_etags(self):
+        """Persist the validators collected during this run"""
+        with self._etag_lock:
+            etags = dict(self._etags)
+        tmp_path = self._etags_path + '.tmp'
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(etags, f, indent=2)
+            os.replace(tmp_path, self._etags_path)
+        except OSError as e:
+            print(f"Warning: Could not save ETags: {e}")
+
+    def _conditional_get(self, url, timeout=15):
+        """GET a JSON document, revalidating any stored copy with If-None-Match/If-Modified-Since"""
+        with self._etag_lock:
+            cached = self._etags.get(url)
+        
+        headers = {}
+        if cached and os.path.exists(cached['body_path']):
+            if cached.get('etag'):
+                headers['If-None-Match'] = cached['etag']
+            if cached.get('last_modified'):
+                headers['If-Modified-Since'] = cached['last_modified']
+        else:
+            cached = None
+        
+        response = self._get(url, timeout=timeout, headers=headers)
+        if response.status_code == 304 and cached:
+            # Unchanged: reuse the stored body, nothing was downloaded
+            with open(cached['body_path'], 'rb') as f:
+                return _loads(f.read())
+        response.raise_for_status()
+        if not self._encoding_logged:
+            self._encoding_logged = True
+            print(f"    Response encoding: {response.headers.get('Content-Encoding', 'identity')} "
+                  f"(requested {self.session.headers.get('Accept-Encoding')})")
+        
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if etag or last_modified:
+            body_path = os.path.join(self._etag_dir, hashlib.sha1(url.encode('utf-8')).hexdigest() + '.json')
+            try:
+                os.makedirs(self._etag_dir, exist_ok=True)
+                # Per-thread temp name: two teams can share the same $ref URL
+                tmp_path = f"{body_path}.{threading.get_ident()}.tmp"
+                with open(tmp_path, 'wb') as f:
+                    f.write(response.content)
+                os.replace(tmp_path, body_path)
+                with self._etag_lock:
+                    self._etags[url] = {
+                        'etag': etag,
+                        'last_modified': last_modified,
+                        'body_path': body_path
+                    }
+            except OSError as e:
+                print(f"    Warning: Could not store body for {url}: {e}")
+        
+        return _loads(response.content)
+
+    def _ref_cache_path(self, url):
+        return os.path.join(self._ref_cache_dir, hashlib.sha1(url.encode('utf-8')).hexdigest() + '.json')
+
+    def _read_ref_cache(self, url):
+        """Return the stored JSON for url if it is younger than REF_CACHE_TTL, else None"""
+        path = self._ref_cache_path(url)
+        try:
+            if time.time() - os.path.getmtime(path) > self.REF_CACHE_TTL:
+                return None
+            with open(path, 'rb') as f:
+                return _loads(f.read())
+        except (OSError, ValueError):
+            return None
+
+    def _write_ref_cache(self, url, data):
+        """Store data for url, atomically so a concurrent reader never sees a partial file"""
+        path = self._ref_cache_path(url)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        raw = orjson.dumps(data) if orjson is not None else json.dumps(data).encode('utf-8')
+        try:
+            os.makedirs(self._ref_cache_dir, exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                f.write(raw)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"    Warning: Could not cache {url}: {e}")
+
+    def _cached_fetch(self, url, timeout=10, persist=False):
+        """Fetch a $ref URL once per run; concurrent callers share the in-flight request.
+        
+        With persist=True the body is also kept in .ref_cache/ across runs.
+        """
+        with self._ref_cache_lock:
+            future = self._ref_cache.get(url)
+            owner = future is None
+            if owner:
+                future = self._ref_cache[url] = Future()
+        
+        if owner:
+            try:
+                data = self._read_ref_cache(url) if persist else None
+                if data is None:
+                    data = self._conditional_get(url, timeout=timeout)
+                    if persist:
+                        self._write_ref_cache(url, data)
+                future.set_result(data)
+            except Exception as e:
+                # Don't memoize failures; a later caller may retry
+                with self._ref_cache_lock:
+                    self._ref_cache.pop(url, None)
+                future.set_exception(e)
+        return future.result()
+
     def fetch_teams_list(self):
         """Fetch list of all NFL teams"""
         url = f"{self.site_url}/teams"
         print(f"Fetching teams list from: {url}")
         
         try:
-            response = self.session.get(url, timeout=30)
-            response.raise_for_status()
-            data = response.json()
+            data = self._conditional_get(url, timeout=30)
             
             if 'sports' in data and data['sports']:
                 sport = data['sports'][0]
@@ -65,9 +500,9 @@ class NFLTeamsScraper:
         print(f"Fetching teams from: {url}")
         
         try:
-            response = self.session.get(url, timeout=30)
+            response = self._get(url, timeout=30)
             response.raise_for_status()
-            data = response.json()
+            data = _loads(response.content)
             
             if 'items' in data:
                 print(f"Found {len(data['items'])} team references")
@@ -94,9 +529,9 @@ class NFLTeamsScraper:
                 return None
             
             print(f"  Fetching team details from: {team_url}")
-            response = self.session.get(team_url, timeout=15)
+            response = self._get(team_url, timeout=15)
             response.raise_for_status()
-            return response.json()
+            return _loads(response.content)
             
         except Exception as e:
             print(f"  Error fetching team details: {e}")
@@ -104,135 +539,109 @@ class NFLTeamsScraper:
 
     def process_team_data(self, teams_data):
         """Process team data and extract relevant information"""
-        processed_teams = []
-        
-        print(f"Processing {len(teams_data)} teams...")
-        
-        for i, team_ref in enumerate(teams_data):
-            try:
-                print(f"Processing team {i+1}/{len(teams_data)}")
-                
-                # Fetch detailed team data
-                team_data = self.fetch_team_details(team_ref)
-                if not team_data:
-                    continue
-                
-                # Handle direct team data vs reference
-                if isinstance(team_data, dict) and 'team' in team_data:
-                    team = team_data['team']
-                else:
-                    team = team_data
-                
-                # Extract team information
-                team_info = {
-                    'id': team.get('id', ''),
-                    'guid': team.get('guid', ''),
-                    'uid': team.get('uid', ''),
-                    'name': team.get('name', ''),
-                    'display_name': team.get('displayName', ''),
-                    'short_display_name': team.get('shortDisplayName', ''),
-                    'nickname': team.get('nickname', ''),
-                    'location': team.get('location', ''),
-                    'abbreviation': team.get('abbreviation', ''),
-                    'color': team.get('color', ''),
-                    'alternate_color': team.get('alternateColor', ''),
-                    'is_active': team.get('isActive', True),
-                    'is_all_star': team.get('isAllStar', False),
-                    'logos': [],
-                    'record': {},
-                    'venue': {},
-                    'conference': '',
-                    'division': ''
-                }
-                
-                # Extract logos
-                if 'logos' in team and team['logos']:
-                    for logo in team['logos']:
-                        logo_info = {
-                            'href': logo.get('href', ''),
-                            'alt': logo.get('alt', ''),
-                            'rel': logo.get('rel', []),
-                            'width': logo.get('width', ''),
-                            'height': logo.get('height', '')
-                        }
-                        team_info['logos'].append(logo_info)
-                
-                # Extract venue information
-                if 'venue' in team and team['venue']:
-                    venue = team['venue']
-                    # Handle venue reference
-                    if isinstance(venue, dict) and '$ref' in venue:
-                        venue_data = self.fetch_venue_details(venue['$ref'])
-                        if venue_data:
-                            venue = venue_data
-                    
-                    if isinstance(venue, dict):
-                        team_info['venue'] = {
-                            'id': venue.get('id', ''),
-                            'name': venue.get('fullName', ''),
-                            'capacity': venue.get('capacity', ''),
-                            'grass': venue.get('grass', ''),
-                            'city': '',
-                            'state': ''
-                        }
-                        
-                        # Extract address
-                        if 'address' in venue and venue['address']:
-                            address = venue['address']
-                            team_info['venue']['city'] = address.get('city', '')
-                            team_info['venue']['state'] = address.get('state', '')
-                
-                # Extract group information (conference/division)
-                if 'groups' in team and team['groups']:
-                    for group in team['groups']:
-                        if isinstance(group, dict) and '$ref' in group:
-                            group_data = self.fetch_group_details(group['$ref'])
-                            if group_data:
-                                group = group_data
-                        
-                        if isinstance(group, dict):
-                            group_name = group.get('name', '').lower()
-                            if 'conference' in group_name:
-                                team_info['conference'] = group.get('name', '')
-                            elif 'division' in group_name or any(div in group_name for div in ['east', 'west', 'north', 'south']):
-                                team_info['division'] = group.get('name', '')
+        total = len(teams_data)
+        print(f"Processing {total} teams...")
+        
+        # Teams are processed concurrently; their venue/group/record references
+        # go to a second pool so a team worker waiting on its own sub-fetches
+        # can never starve the pool it is running in
+        with ThreadPoolExecutor(max_workers=self.MAX_WORKERS) as team_pool, \
+                ThreadPoolExecutor(max_workers=self.MAX_WORKERS) as ref_pool:
+            self._ref_pool = ref_pool
+            futures = [team_pool.submit(self._process_one, i, total, team_ref)
+                       for i, team_ref in enumerate(teams_data, 1)]
+            results = [f.result() for f in futures]
+        self._ref_pool = None
+        
+        processed_teams = [team_info for team_info in results if team_info]
+        print(f"Successfully processed {len(processed_teams)} teams")
+        return processed_teams
+
+    def _submit_ref(self, fetch, obj):
+        """Start fetching a $ref sub-resource in the background, if obj is one"""
+        if isinstance(obj, dict) and '$ref' in obj:
+            return self._ref_pool.submit(fetch, obj['$ref'])
+        return None
+
+    @staticmethod
+    def _resolve_ref(obj, future):
+        """Return the fetched sub-resource, or obj itself if nothing was fetched"""
+        if future is not None:
+            data = future.result()
+            if data:
+                return data
+        return obj
+
+    def _process_one(self, index, total, team_ref):
+        """Fetch and extract a single team; returns None on failure"""
+        try:
+            print(f"Processing team {index}/{total}")
+            
+            # Fetch detailed team data
+            team_data = self.fetch_team_details(team_ref)
+            if not team_data:
+                return None
+            
+            # Handle direct team data vs reference
+            if isinstance(team_data, dict) and 'team' in team_data:
+                team = team_data['team']
+            else:
+                team = team_data
+            
+            # Kick off all of this team's sub-resource fetches at once
+            venue = team.get('venue')
+            groups = team.get('groups') or []
+            record = team.get('record')
+            venue_future = self._submit_ref(self.fetch_venue_details, venue)
+            group_futures = [self._submit_ref(self.fetch_group_details, group) for group in groups]
+            record_future = self._submit_ref(self.fetch_record_details, record)
+            
+            # Extract team information
+            team_info = _extract(team)
+            team_info['logos'] = [_extract_logo(logo) for logo in team.get('logos') or []]
+            
+            # Extract venue information
+            if venue:
+                venue = self._resolve_ref(venue, venue_future)
                 
-                # Extract current record
-                if 'record' in team and team['record']:
-                    record = team['record']
-                    if isinstance(record, dict) and '$ref' in record:
-                        record_data = self.fetch_record_details(record['$ref'])
-                        if record_data:
-                            record = record_data
+                if isinstance(venue, dict):
+                    team_info['venue'] = _extract_venue(venue)
                     
-                    if isinstance(record, dict):
-                        team_info['record'] = {
-                            'wins': record.get('wins', 0),
-                            'losses': record.get('losses', 0),
-                            'ties': record.get('ties', 0),
-                            'percentage': record.get('percentage', 0.0),
-                            'summary': record.get('summary', '')
-                        }
-                
-                processed_teams.append(team_info)
-                print(f"  Successfully processed: {team_info['display_name']} ({team_info['abbreviation']})")
+                    # Extract address
+                    if 'address' in venue and venue['address']:
+                        address = venue['address']
+                        team_info['venue']['city'] = address.get('city', '')
+                        team_info['venue']['state'] = address.get('state', '')
+            
+            # Extract group information (conference/division)
+            for group, group_future in zip(groups, group_futures):
+                group = self._resolve_ref(group, group_future)
                 
-                # Rate limiting
-                time.sleep(0.3)
+                if isinstance(group, dict):
+                    group_name = group.get('name', '')
+                    if 'conference' in group_name.lower():
+                        team_info['conference'] = group_name
+                    elif _DIVISION_RE.search(group_name):
+                        team_info['division'] = group_name
+            
+            # Extract current record
+            if record:
+                record = self._resolve_ref(record, record_future)
                 
-            except Exception as e:
-                print(f"Error processing team {i+1}: {e}")
-                continue
-        
-        print(f"Successfully processed {len(processed_teams)} teams")
-        return processed_teams
+                if isinstance(record, dict):
+                    team_info['record'] = _extract_record(record)
+            
+            print(f"  Successfully processed: {team_info['display_name']} ({team_info['abbreviation']})")
+            return team_info
+            
+        except Exception as e:
+            print(f"Error processing team {index}: {e}")
+            return None
 
     def fetch_venue_details(self, venue_url):
         """Fetch venue details from reference URL"""
         try:
-            response = self.session.get(venue_url, timeout=10)
-            response.raise_for_status()
-            return response.json()
+            return self._cached_fetch(venue_url, timeout=10, persist=True)
         except Exception as e:
             print(f"    Error fetching venue: {e}")
             return None
@@ -240,9 +649,7 @@ class NFLTeamsScraper:
     def fetch_group_details(self, group_url):
         """Fetch group (conference/division) details from reference URL"""
         try:
-            response = self.session.get(group_url, timeout=10)
-            response.raise_for_status()
-            return response.json()
+            return self._cached_fetch(group_url, timeout=10, persist=True)
         except Exception as e:
             print(f"    Error fetching group: {e}")
             return None
@@ -250,143 +657,190 @@ class NFLTeamsScraper:
     def fetch_record_details(self, record_url):
         """Fetch team record details from reference URL"""
         try:
-            response = self.session.get(record_url, timeout=10)
-            response.raise_for_status()
-            return response.json()
+            # Records change every week; never served from the persistent cache
+            return self._cached_fetch(record_url, timeout=10)
         except Exception as e:
             print(f"    Error fetching record: {e}")
             return None
 
-    def convert_to_xml(self, teams):
-        """Convert teams data to XML format"""
-        root = ET.Element("nfl_teams_2025")
-        
-        # Add metadata
-        metadata = ET.SubElement(root, "metadata")
-        ET.SubElement(metadata, "season").text = "2025"
-        ET.SubElement(metadata, "total_teams").text = str(len(teams))
-        ET.SubElement(metadata, "generated_date").text = datetime.now().isoformat()
-        ET.SubElement(metadata, "source").text = "ESPN API"
-        
-        # Group teams by conference
-        afc_teams = [t for t in teams if 'afc' in t.get('conference', '').lower()]
-        nfc_teams = [t for t in teams if 'nfc' in t.get('conference', '').lower()]
-        other_teams = [t for t in teams if t not in afc_teams and t not in nfc_teams]
-        
-        # Add conferences
-        for conf_name, conf_teams in [("AFC", afc_teams), ("NFC", nfc_teams), ("Other", other_teams)]:
-            if not conf_teams:
-                continue
-                
-            conference = ET.SubElement(root, "conference")
-            ET.SubElement(conference, "name").text = conf_name
-            ET.SubElement(conference, "team_count").text = str(len(conf_teams))
-            
-            # Sort teams by division, then by name
-            conf_teams.sort(key=lambda x: (x.get('division', ''), x.get('display_name', '')))
-            
-            for team in conf_teams:
-                team_element = ET.SubElement(conference, "team")
-                
-                # Basic info
-                ET.SubElement(team_element, "id").text = str(team.get('id', ''))
-                ET.SubElement(team_element, "guid").text = team.get('guid', '')
-                ET.SubElement(team_element, "uid").text = team.get('uid', '')
-                ET.SubElement(team_element, "name").text = team.get('name', '')
-                ET.SubElement(team_element, "display_name").text = team.get('display_name', '')
-                ET.SubElement(team_element, "short_display_name").text = team.get('short_display_name', '')
-                ET.SubElement(team_element, "nickname").text = team.get('nickname', '')
-                ET.SubElement(team_element, "location").text = team.get('location', '')
-                ET.SubElement(team_element, "abbreviation").text = team.get('abbreviation', '')
-                ET.SubElement(team_element, "color").text = team.get('color', '')
-                ET.SubElement(team_element, "alternate_color").text = team.get('alternate_color', '')
-                ET.SubElement(team_element, "is_active").text = str(team.get('is_active', True)).lower()
-                ET.SubElement(team_element, "division").text = team.get('division', '')
-                
-                # Logos
-                if team.get('logos'):
-                    logos_element = ET.SubElement(team_element, "logos")
-                    for logo in team['logos']:
-                        logo_element = ET.SubElement(logos_element, "logo")
-                        ET.SubElement(logo_element, "href").text = logo.get('href', '')
-                        ET.SubElement(logo_element, "alt").text = logo.get('alt', '')
-                        ET.SubElement(logo_element, "width").text = str(logo.get('width', ''))
-                        ET.SubElement(logo_element, "height").text = str(logo.get('height', ''))
-                        if logo.get('rel'):
-                            rel_element = ET.SubElement(logo_element, "rel")
-                            rel_element.text = ','.join(logo['rel']) if isinstance(logo['rel'], list) else str(logo['rel'])
-                
-                # Venue
-                venue = team.get('venue', {})
-                if venue:
-                    venue_element = ET.SubElement(team_element, "venue")
-                    ET.SubElement(venue_element, "id").text = str(venue.get('id', ''))
-                    ET.SubElement(venue_element, "name").text = venue.get('name', '')
-                    ET.SubElement(venue_element, "capacity").text = str(venue.get('capacity', ''))
-                    ET.SubElement(venue_element, "grass").text = str(venue.get('grass', '')).lower()
-                    ET.SubElement(venue_element, "city").text = venue.get('city', '')
-                    ET.SubElement(venue_element, "state").text = venue.get('state', '')
-                
-                # Record
-                record = team.get('record', {})
-                if record:
-                    record_element = ET.SubElement(team_element, "record")
-                    ET.SubElement(record_element, "wins").text = str(record.get('wins', 0))
-                    ET.SubElement(record_element, "losses").text = str(record.get('losses', 0))
-                    ET.SubElement(record_element, "ties").text = str(record.get('ties', 0))
-                    ET.SubElement(record_element, "percentage").text = str(record.get('percentage', 0.0))
-                    ET.SubElement(record_element, "summary").text = record.get('summary', '')
-        
-        return root
-
-    def prettify_xml(self, elem):
-        """Return a pretty-printed XML string"""
-        rough_string = ET.tostring(elem, 'unicode')
-        reparsed = minidom.parseString(rough_string)
-        return reparsed.toprettyxml(indent="  ")
-
-    def save_xml(self, xml_root, filename=None):
-        """Save XML to file in the same directory as the script"""
+    def partition_by_conference(self, teams):
+        """Group teams into AFC/NFC/Other in one pass, each sorted by division then name"""
+        buckets = {name: [] for name in _CONFERENCE_BUCKETS}
+        for t in teams:
+            conf = t.get('conference', '').lower()
+            buckets['AFC' if 'afc' in conf else 'NFC' if 'nfc' in conf else 'Other'].append(t)
+        
+        # Both sort keys are always set by process_team_data
+        sort_key = operator.itemgetter('division', 'display_name')
+        for conf_teams in buckets.values():
+            conf_teams.sort(key=sort_key)
+        return buckets
+
+    def _conference_fragments(self, buckets, team_count):
+        """Yield conference XML fragments in order, using worker processes for large team sets"""
+        if team_count < self.XML_PROCESS_THRESHOLD:
+            for conf_name, conf_teams in buckets:
+                yield build_conference_xml(conf_name, conf_teams)
+            return
+        
+        # Workers only build strings; this process alone writes the file
+        names, team_lists = zip(*buckets)
+        with ProcessPoolExecutor(max_workers=min(len(buckets), os.cpu_count() or 1)) as pool:
+            yield from pool.map(build_conference_xml, names, team_lists)
+
+    def emit_both(self, teams, json_path=None, xml_path=None):
+        """Write the JSON backup and the XML file together in one pass over the teams"""
         script_dir = self.get_script_directory()
-        
-        if not filename:
-            filename = "2025_nfl_teams.xml"
-        
-        filename = os.path.basename(filename)
-        full_path = os.path.join(script_dir, filename)
+        json_path = os.path.join(script_dir, os.path.basename(json_path or "2025_nfl_teams.json"))
+        xml_path = os.path.join(script_dir, os.path.basename(xml_path or "2025_nfl_teams.xml"))
         
         # Create backup if file exists
-        if os.path.exists(full_path):
-            backup_path = full_path.replace('.xml', f'_backup_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xml')
+        if os.path.exists(xml_path):
+            backup_path = xml_path.replace('.xml', f'_backup_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xml')
             try:
                 import shutil
-                shutil.copy2(full_path, backup_path)
+                shutil.copy2(xml_path, backup_path)
                 print(f"📦 Backup created: {os.path.basename(backup_path)}")
             except Exception as e:
                 print(f"Warning: Could not create backup: {e}")
         
-        xml_string = self.prettify_xml(xml_root)
-        
-        with open(full_path, 'w', encoding='utf-8') as f:
-            f.write(xml_string)
+        metadata = {
+            'season': 2025,
+            'total_teams': len(teams),
+            'generated_date': datetime.now().isoformat(),
+            'source': 'ESPN API'
+        }
+        buckets = [(name, conf_teams) for name, conf_teams in self.partition_by_conference(teams).items() if conf_teams]
+        
+        # Each team is serialized straight into both files as the buckets are
+        # walked, so neither document is ever assembled in memory. XML layout
+        # matches ET.indent(space="  "); JSON matches a whole-document indent=2
+        # dump, with teams in conference/division order
+        with open(json_path, 'wb') as jf, open(xml_path, 'w', encoding='utf-8') as xf:
+            jf.write(b'{\n  "metadata": ' + _indent_json(_dumps_pretty(metadata), 2) + b',\n  "teams": [')
+            xf.write("<?xml version='1.0' encoding='utf-8'?>\n")
+            xf.write("<nfl_teams_2025>\n")
+            
+            # Add metadata
+            xf.write("  <metadata>\n")
+            xf.write(_xml_leaf(2, "season", metadata['season']))
+            xf.write(_xml_leaf(2, "total_teams", metadata['total_teams']))
+            xf.write(_xml_leaf(2, "generated_date", metadata['generated_date']))
+            xf.write(_xml_leaf(2, "source", metadata['source']))
+            xf.write("  </metadata>\n")
+            
+            # Add conferences
+            separator = b'\n    '
+            for (conf_name, conf_teams), fragment in zip(buckets, self._conference_fragments(buckets, len(teams))):
+                xf.write(fragment)
+                for team in conf_teams:
+                    jf.write(separator + _indent_json(_dumps_pretty(team), 4))
+                    separator = b',\n    '
+            
+            jf.write(b'\n  ]\n}' if teams else b']\n}')
+            xf.write("</nfl_teams_2025>")
         
-        print(f"XML file saved as: {full_path}")
-        return full_path
+        print(f"JSON backup saved as: {json_path}")
+        print(f"XML file saved as: {xml_path}")
+        return json_path, xml_path
 
-    def save_json(self, data, filename=None):
-        """Save JSON data for backup"""
+    def save_parquet(self, teams, filename=None):
+        """Save teams as a flat, columnar Parquet table (requires pyarrow)"""
+        if pa is None:
+            print("pyarrow not installed, skipping Parquet export")
+            return None
+        
         script_dir = self.get_script_directory()
         
         if not filename:
-            filename = "2025_nfl_teams.json"
+            filename = "2025_nfl_teams.parquet"
         
         filename = os.path.basename(filename)
         full_path = os.path.join(script_dir, filename)
         
-        with open(full_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-        
-        print(f"JSON backup saved as: {full_path}")
+        logo_type = pa.struct([
+            ('href', pa.string()),
+            ('alt', pa.string()),
+            ('rel', pa.list_(pa.string())),
+            ('width', pa.int64()),
+            ('height', pa.int64()),
+        ])
+        schema = pa.schema([
+            ('id', pa.string()),
+            ('guid', pa.string()),
+            ('uid', pa.string()),
+            ('name', pa.string()),
+            ('display_name', pa.string()),
+            ('short_display_name', pa.string()),
+            ('nickname', pa.string()),
+            ('location', pa.string()),
+            ('abbreviation', pa.string()),
+            ('color', pa.string()),
+            ('alternate_color', pa.string()),
+            ('is_active', pa.bool_()),
+            ('is_all_star', pa.bool_()),
+            ('conference', pa.string()),
+            ('division', pa.string()),
+            ('venue_id', pa.string()),
+            ('venue_name', pa.string()),
+            ('venue_capacity', pa.int64()),
+            ('venue_grass', pa.bool_()),
+            ('venue_city', pa.string()),
+            ('venue_state', pa.string()),
+            ('wins', pa.int64()),
+            ('losses', pa.int64()),
+            ('ties', pa.int64()),
+            ('percentage', pa.float64()),
+            ('record_summary', pa.string()),
+            ('logos', pa.list_(logo_type)),
+        ])
+        
+        # One row per team, nested venue/record flattened into columns
+        rows = []
+        for team in teams:
+            venue = team.get('venue') or {}
+            record = team.get('record') or {}
+            grass = venue.get('grass')
+            rows.append({
+                'id': str(team.get('id', '')),
+                'guid': team.get('guid', ''),
+                'uid': team.get('uid', ''),
+                'name': team.get('name', ''),
+                'display_name': team.get('display_name', ''),
+                'short_display_name': team.get('short_display_name', ''),
+                'nickname': team.get('nickname', ''),
+                'location': team.get('location', ''),
+                'abbreviation': team.get('abbreviation', ''),
+                'color': team.get('color', ''),
+                'alternate_color': team.get('alternate_color', ''),
+                'is_active': bool(team.get('is_active', True)),
+                'is_all_star': bool(team.get('is_all_star', False)),
+                'conference': team.get('conference', ''),
+                'division': team.get('division', ''),
+                'venue_id': str(venue.get('id', '')),
+                'venue_name': venue.get('name', ''),
+                'venue_capacity': _to_int(venue.get('capacity')),
+                'venue_grass': grass if isinstance(grass, bool) else None,
+                'venue_city': venue.get('city', ''),
+                'venue_state': venue.get('state', ''),
+                'wins': _to_int(record.get('wins')),
+                'losses': _to_int(record.get('losses')),
+                'ties': _to_int(record.get('ties')),
+                'percentage': _to_float(record.get('percentage')),
+                'record_summary': record.get('summary', ''),
+                'logos': [{
+                    'href': logo.get('href', ''),
+                    'alt': logo.get('alt', ''),
+                    'rel': [str(r) for r in (logo.get('rel') or [])],
+                    'width': _to_int(logo.get('width')),
+                    'height': _to_int(logo.get('height')),
+                } for logo in team.get('logos', [])],
+            })
+        
+        table = pa.Table.from_pylist(rows, schema=schema)
+        pq.write_table(table, full_path, compression='zstd')
+        
+        print(f"Parquet file saved as: {full_path}")
         return full_path
 
     def run(self):
@@ -408,6 +862,7 @@ class NFLTeamsScraper:
         # Process team data
         print("\n🔄 Processing team details...")
         processed_teams = self.process_team_data(teams_data)
+        self._save_etags()
         
         if not processed_teams:
             print("❌ No teams could be processed.")
@@ -427,37 +882,24 @@ class NFLTeamsScraper:
         for conf, teams in conferences.items():
             print(f"  {conf}: {len(teams)} teams")
         
-        # Save JSON backup
-        print("\n💾 Saving JSON backup...")
-        json_data = {
-            'metadata': {
-                'season': 2025,
-                'total_teams': len(processed_teams),
-                'generated_date': datetime.now().isoformat(),
-                'source': 'ESPN API'
-            },
-            'teams': processed_teams
-        }
-        json_file = self.save_json(json_data)
-        
-        # Convert to XML
-        print("\n🔄 Converting to XML...")
-        xml_root = self.convert_to_xml(processed_teams)
-        
-        # Save XML file
-        print("\n💾 Saving XML file...")
-        xml_file = self.save_xml(xml_root)
+        # Save JSON backup and XML file
+        print("\n💾 Saving JSON backup and XML file...")
+        json_file, xml_file = self.emit_both(processed_teams)
+        parquet_file = self.save_parquet(processed_teams)
         
         print(f"\n🎉 Success! Files created:")
         print(f"📄 XML: {xml_file}")
         print(f"📄 JSON: {json_file}")
+        if parquet_file:
+            print(f"📄 Parquet: {parquet_file}")
         print(f"\n📈 Summary: {len(processed_teams)} NFL teams with complete data")
         
         return True
 
 def main():
     """Main function"""
-    scraper = NFLTeamsScraper()
+    # --no-cache forces fresh downloads even when requests_cache is installed
+    scraper = NFLTeamsScraper(use_cache='--no-cache' not in sys.argv[1:])
     
     try:
         success = scraper.run()
@@ -15,13 +15,25 @@
 # Output:
 #   ./teams.xml (pretty-printed)
 
+import argparse
+import hashlib
+import json
+import os
 import sys
 import time
 import re
-from typing import List, Dict, Optional, Tuple, Set
+from functools import lru_cache
+from typing import Any, List, Dict, Optional, Tuple, FrozenSet
+from concurrent.futures import ThreadPoolExecutor
 import requests
-from bs4 import BeautifulSoup
-from xml.etree.ElementTree import Element, SubElement, ElementTree
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+try:
+    from selectolax.lexbor import LexborHTMLParser  # C (Lexbor) HTML5 parser + CSS engine
+except ImportError:  # optional; BeautifulSoup's html.parser is the fallback
+    LexborHTMLParser = None
+    from bs4 import BeautifulSoup
+from xml.sax.saxutils import escape
 
 # -------------------- Config --------------------
 
@@ -30,40 +42,218 @@ FCS_URL = "https://en.wikipedia.org/wiki/List_of_NCAA_Division_I_FCS_football_pr
 AC_SEASON_URL = "https://en.wikipedia.org/wiki/2025_American_Conference_football_season"
 SEC_SEASON_URL = "https://en.wikipedia.org/wiki/2025_Southeastern_Conference_football_season"
 NFL_TEAMS_URL = "https://www.nfl.com/teams"
+ALL_URLS = (FBS_URL, FCS_URL, AC_SEASON_URL, SEC_SEASON_URL, NFL_TEAMS_URL)
 
 USER_AGENT = "Mozilla/5.0 (compatible; maker-teamsxml/4.0)"
 TIMEOUT = 30
 
+# Downloaded pages are reused for an hour; the sources change at most daily
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "teams")
+CACHE_TTL = 3600
+
+# Dump the full membership key lists to stderr (-v, or when watching a terminal)
+VERBOSE = sys.stderr.isatty()
+
+# Patterns used on every table row, compiled once
+_RE_NONALNUM = re.compile(r"[^a-z0-9]")
+_RE_FOOTNOTE = re.compile(r"\[[^\]]*\]")
+_RE_WS = re.compile(r"\s+")
+_RE_PARENS_TAIL = re.compile(r"\s*\(.*\)$")
+_RE_BG_URL = re.compile(r"background-image:\s*url\(([^)]+)\)")
+_RE_NONALPHA = re.compile(r"[^a-z]")
+_RE_ACC = re.compile(r"\bacc\b")
+_RE_SEC = re.compile(r"\bsec\b")
+# Single-pass character folding for cell text: NBSP -> space, en/em dash -> "-",
+# zero-width space dropped
+_TRANS = str.maketrans({"\xa0": " ", "\u2013": "-", "\u2014": "-", "\u200b": ""})
+# A cell can only classify as SEC/Big Sky if it contains one of these
+_CONF_HINTS = ("sec", "southeastern", "sky")
+
 # -------------------- HTTP --------------------
 
+# One keep-alive session for every page; connections to en.wikipedia.org are reused
+SESSION = requests.Session()
+SESSION.headers["User-Agent"] = USER_AGENT
+_adapter = HTTPAdapter(pool_connections=8, pool_maxsize=8,
+                       max_retries=Retry(total=2, backoff_factor=0.3))
+SESSION.mount("https://", _adapter)
+SESSION.mount("http://", _adapter)
+
+def _cache_paths(url: str) -> Tuple[str, str]:
+    """(body, validators sidecar) paths for url's cache entry."""
+    base = os.path.join(CACHE_DIR, hashlib.sha1(url.encode("utf-8")).hexdigest())
+    return base + ".html", base + ".json"
+
+def _write_atomic(path: str, text: str) -> None:
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(path + ".tmp", path)
+
+def clear_cache() -> None:
+    """Drop every cached page so the next fetch goes to the network."""
+    try:
+        names = os.listdir(CACHE_DIR)
+    except OSError:
+        return
+    for name in names:
+        if name.endswith((".html", ".json")):
+            try:
+                os.remove(os.path.join(CACHE_DIR, name))
+            except OSError:
+                pass
+
 def fetch(url: str) -> str:
-    r = requests.get(url, headers={"User-Agent": USER_AGENT}, timeout=TIMEOUT)
+    path, meta_path = _cache_paths(url)
+    cached = None
+    try:
+        with open(path, encoding="utf-8") as f:
+            cached = f.read()
+        if time.time() - os.path.getmtime(path) < CACHE_TTL:
+            return cached
+    except OSError:
+        pass
+
+    # Stale copy on disk: ask the server whether it changed (304) before
+    # downloading the whole page again
+    headers = {}
+    if cached is not None:
+        try:
+            with open(meta_path, encoding="utf-8") as f:
+                validators = json.load(f)
+        except (OSError, ValueError):
+            validators = {}
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+
+    r = SESSION.get(url, headers=headers, timeout=TIMEOUT)
+    if r.status_code == 304 and cached is not None:
+        try:
+            os.utime(path)  # still current; good for another CACHE_TTL
+        except OSError:
+            pass
+        return cached
     r.raise_for_status()
-    return r.text
+    text = r.text
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        _write_atomic(path, text)
+        _write_atomic(meta_path, json.dumps({
+            "etag": r.headers.get("ETag"),
+            "last_modified": r.headers.get("Last-Modified"),
+        }))
+    except OSError as e:
+        print(f"[HTTP] Could not cache {url}: {e}", file=sys.stderr)
+    return text
+
+def fetch_all(urls) -> Dict[str, str]:
+    """Fetch all urls concurrently; a failed url is left out (callers re-fetch and see the error)."""
+    urls = list(dict.fromkeys(urls))
+    pages: Dict[str, str] = {}
+
+    def grab(url: str) -> None:
+        try:
+            pages[url] = fetch(url)
+        except Exception as e:
+            print(f"[HTTP] Prefetch failed for {url}: {e}", file=sys.stderr)
+
+    with ThreadPoolExecutor(max_workers=len(urls) or 1) as ex:
+        list(ex.map(grab, urls))
+    return pages
+
+def get_page(url: str, pages: Optional[Dict[str, str]] = None) -> str:
+    """Prefetched HTML for url if available, otherwise fetch it now."""
+    if pages and url in pages:
+        return pages[url]
+    return fetch(url)
+
+# -------------------- HTML parsing --------------------
+# Thin layer over selectolax (preferred) or BeautifulSoup so the scrapers below
+# don't care which one is installed. Text is joined the way bs4's
+# get_text(sep, strip=True) does: each text node stripped, empty ones dropped.
+
+Node = Any
+
+def parse_html(html: str) -> Node:
+    if LexborHTMLParser is not None:
+        return LexborHTMLParser(html)
+    return BeautifulSoup(html, "html.parser")
+
+# url -> parsed DOM, so a page read by several scrapers is parsed only once
+_PARSED: Dict[str, Node] = {}
+
+def parse_page(url: str, pages: Optional[Dict[str, str]] = None) -> Node:
+    tree = _PARSED.get(url)
+    if tree is None:
+        tree = _PARSED[url] = parse_html(get_page(url, pages))
+    return tree
+
+def css(node: Node, selector: str) -> List[Node]:
+    if LexborHTMLParser is not None:
+        return node.css(selector)
+    return node.select(selector)
+
+def css_first(node: Node, selector: str) -> Optional[Node]:
+    if LexborHTMLParser is not None:
+        return node.css_first(selector)
+    return node.select_one(selector)
+
+def node_text(node: Node, sep: str = "") -> str:
+    if LexborHTMLParser is None:
+        return node.get_text(sep, strip=True)
+    if not sep:
+        return node.text(strip=True)
+    return sep.join(p for p in node.text(separator="\0", strip=True).split("\0") if p)
+
+def tag_name(node: Node) -> str:
+    if LexborHTMLParser is not None:
+        return node.tag
+    return node.name
+
+def attr(node: Node, name: str) -> Optional[str]:
+    if LexborHTMLParser is not None:
+        return node.attributes.get(name)
+    return node.get(name)
 
 # -------------------- Small utils --------------------
 
+@lru_cache(maxsize=4096)
 def norm(s: str) -> str:
     """normalize for matching (letters+digits only, lowercase)."""
-    return re.sub(r"[^a-z0-9]", "", (s or "").lower())
-
+    return _RE_NONALNUM.sub("", (s or "").lower())
+
+# Header label -> canonical key. Exact labels are looked up first; otherwise
+# the first rule whose substrings all appear in the label wins.
+_HEADER_EXACT = {
+    "team": "team", "nickname": "team", "mascot": "team",
+    "location": "location", "city": "city", "state": "state",
+    "ncaa division": "subdivision", "division": "subdivision",
+}
+_HEADER_RULES = (
+    (("conference",), "conference"),
+    (("stadium",), "stadium"),
+    (("school",), "school"),
+    (("university",), "school"),
+    (("institution",), "school"),
+    (("first", "season"), "first_season"),
+    (("joined",), "joined"),
+    (("link",), "link"),
+    (("subdivision",), "subdivision"),
+)
+
+@lru_cache(maxsize=256)
 def normalize_header(h: str) -> str:
     """Map various table header labels into canonical keys."""
     h = (h or "")
-    h = re.sub(r"\[[^\]]*\]", "", h)  # strip footnotes like [1], [a]
+    h = _RE_FOOTNOTE.sub("", h)  # strip footnotes like [1], [a]
     h = h.replace("\xa0", " ").strip().lower()
-    h = re.sub(r"\s+", " ", h)
-    if "conference" in h: return "conference"
-    if "stadium" in h: return "stadium"
-    if "school" in h or "university" in h or "institution" in h: return "school"
-    if h in ("team", "nickname", "mascot"): return "team"
-    if "first" in h and "season" in h: return "first_season"
-    if "joined" in h: return "joined"
-    if h == "location": return "location"
-    if h == "city": return "city"
-    if h == "state": return "state"
-    if "link" in h: return "link"
-    if "subdivision" in h or h in ("ncaa division", "division"): return "subdivision"
+    h = _RE_WS.sub(" ", h)
+    # None of the exact labels contains a substring rule, so checking them
+    # first doesn't change which rule wins
+    if h in _HEADER_EXACT: return _HEADER_EXACT[h]
+    for subs, canon in _HEADER_RULES:
+        if all(sub in h for sub in subs): return canon
     return h
 
 def split_location(rec: Dict[str, str]) -> Tuple[str, str]:
@@ -75,11 +265,12 @@ def split_location(rec: Dict[str, str]) -> Tuple[str, str]:
         if "," in loc:
             left, right = [p.strip() for p in loc.split(",", 1)]
             city = left
-            state = re.sub(r"\s*\(.*\)$", "", right).strip()
+            state = _RE_PARENS_TAIL.sub("", right).strip()
         else:
             city = loc
     return city, state
 
+@lru_cache(maxsize=32)
 def short_conf(full: str) -> str:
     s = (full or "").lower()
     if "southeastern" in s: return "SEC"
@@ -89,128 +280,142 @@ def short_conf(full: str) -> str:
 
 # -------------------- Wikipedia: generic table parsing --------------------
 
-def find_wikitable_with_conference(soup: BeautifulSoup) -> Optional[BeautifulSoup]:
-    for tbl in soup.select("table.wikitable"):
-        ths = [normalize_header(th.get_text(strip=True)) for th in tbl.select("tr th")]
+def find_wikitable_with_conference(soup: Node) -> Optional[Node]:
+    for tbl in css(soup, "table.wikitable"):
+        ths = [normalize_header(node_text(th)) for th in css(tbl, "tr th")]
         if any(h == "conference" for h in ths):
             return tbl
     return None
 
-def parse_program_table(tbl: BeautifulSoup) -> List[Dict[str, str]]:
+_TEXT_COLS = ("school", "team", "conference", "location", "city", "state", "stadium", "first_season", "joined")
+_LINK_COLS = ("school", "team", "link")  # first one with a link wins
+
+def _clean(v: str) -> str:
+    """Fold NBSP/dashes/zero-width spaces in a cell value (footnotes are gone from the tree)."""
+    return v.translate(_TRANS).strip()
+
+def _cell_text(cell: Node, link: Optional[Node]) -> str:
+    if link:
+        text = node_text(link)
+        if text: return text
+    return node_text(cell, " ")
+
+def _cell_link(cell: Node, link: Optional[Node]) -> str:
+    href = attr(link, "href") if link else None
+    if href is None:
+        # first <a> has no href; look for a later one that does
+        link = css_first(cell, "a[href]")
+        if not link: return ""
+        href = attr(link, "href") or ""
+    if href.startswith("//"): return "https:" + href
+    if href.startswith("/"):  return "https://en.wikipedia.org" + href
+    return href
+
+def parse_program_table(tbl: Node) -> List[Dict[str, str]]:
     """Parse a wikitable of programs into dict rows with flexible headers."""
     rows = []
-    trs = tbl.select("tr")
+    # Drop footnote markers ([1], [a], [citation needed]) from the DOM once,
+    # rather than regex-stripping them out of every extracted cell
+    for sup in css(tbl, "sup.reference, sup.noprint"):
+        sup.decompose()  # same method name on bs4 Tags and lexbor nodes
+    trs = css(tbl, "tr")
     if not trs:
         return rows
-    header_cells = trs[0].find_all(["th", "td"])
-    headers = [normalize_header(c.get_text(strip=True)) for c in header_cells]
+    header_cells = css(trs[0], "th, td")
+    headers = [normalize_header(node_text(c)) for c in header_cells]
     idx = {h: i for i, h in enumerate(headers)}
+    # Resolve column positions once per table instead of per cell lookup
+    text_ix = tuple((col, idx.get(col)) for col in _TEXT_COLS)
+    link_ix = tuple(i for i in (idx.get(col) for col in _LINK_COLS) if i is not None)
 
     for tr in trs[1:]:
-        cells = tr.find_all(["td", "th"])
+        cells = css(tr, "td, th")
         if len(cells) < 2:
             continue
-        if sum(1 for c in cells if c.get_text(strip=True)) < 2:
+        if sum(1 for c in cells if node_text(c)) < 2:
             continue
 
-        def cell_text(col: str) -> str:
-            i = idx.get(col)
-            if i is None or i >= len(cells): return ""
-            link = cells[i].find("a")
-            if link and link.get_text(strip=True): return link.get_text(strip=True)
-            return cells[i].get_text(" ", strip=True)
-
-        def cell_link(col: str) -> str:
-            i = idx.get(col)
-            if i is None or i >= len(cells): return ""
-            link = cells[i].find("a", href=True)
-            if not link: return ""
-            href = link["href"]
-            if href.startswith("//"): return "https:" + href
-            if href.startswith("/"):  return "https://en.wikipedia.org" + href
-            return href
-
-        record = {
-            "school": cell_text("school"),
-            "team": cell_text("team"),
-            "conference": cell_text("conference"),
-            "location": cell_text("location"),
-            "city": cell_text("city"),
-            "state": cell_text("state"),
-            "stadium": cell_text("stadium"),
-            "first_season": cell_text("first_season"),
-            "joined": cell_text("joined"),
-            "link": cell_link("school") or cell_link("team") or cell_link("link"),
-        }
-        # Clean values
-        for k, v in list(record.items()):
-            v = re.sub(r"\[[^\]]+\]", "", v)
-            v = v.replace("\xa0", " ").strip()
-            record[k] = v
+        n = len(cells)
+        anchors: Dict[int, Optional[Node]] = {}  # first <a> per cell, shared by text and link
+        record = {}
+        for col, i in text_ix:
+            if i is None or i >= n:
+                record[col] = ""
+                continue
+            a = anchors[i] = css_first(cells[i], "a")
+            record[col] = _clean(_cell_text(cells[i], a))
+        link = ""
+        for i in link_ix:
+            if i < n:
+                a = anchors[i] if i in anchors else css_first(cells[i], "a")
+                link = _cell_link(cells[i], a)
+                if link:
+                    break
+        record["link"] = _clean(link)
+        # Membership keys, derived once here rather than in every lookup
+        record["_school_key"] = norm(record["school"])
+        record["_team_key"] = norm(record["team"])
 
         rows.append(record)
     return rows
 
 # -------------------- Membership scrapers (AC / SEC) --------------------
 
-def scrape_members_from_season(url: str) -> List[str]:
+def scrape_members_from_season(url: str, pages: Optional[Dict[str, str]] = None) -> List[str]:
     """
     Scrape a season page's standings table(s) and return visible team names (first column).
     Flexible enough to handle divisions/no divisions.
     """
-    html = fetch(url)
-    soup = BeautifulSoup(html, "html.parser")
+    soup = parse_page(url, pages)
     names: List[str] = []
-    for tbl in soup.select("table.wikitable"):
-        headers = [th.get_text(" ", strip=True).lower() for th in tbl.select("tr th")]
+    for tbl in css(soup, "table.wikitable"):
+        headers = [node_text(th, " ").lower() for th in css(tbl, "tr th")]
         if not headers:
             continue
         if "team" in " | ".join(headers):
-            for tr in tbl.select("tr")[1:]:
-                tds = tr.find_all("td")
+            for tr in css(tbl, "tr")[1:]:
+                tds = css(tr, "td")
                 if not tds:
                     continue
-                a = tds[0].find("a")
-                nm = (a.get_text(strip=True) if a else tds[0].get_text(" ", strip=True)).strip()
+                a = css_first(tds[0], "a")
+                nm = (node_text(a) if a else node_text(tds[0], " ")).strip()
                 if nm:
                     names.append(nm)
-    # de-dupe while preserving order
-    seen, out = set(), []
-    for n in names:
-        k = norm(n)
-        if k in seen:
-            continue
-        seen.add(k); out.append(n)
-    return out
-
-def get_ac_member_keys() -> Set[str]:
-    raw = scrape_members_from_season(AC_SEASON_URL)
-    # Exact matching with a few common short->long aliases
-    aliases = {
-        "uab": "university of alabama at birmingham",
-        "utsa": "university of texas at san antonio",
-        "usf": "south florida",
-        "fau": "florida atlantic",
-        "ecu": "east carolina",
-    }
-    expanded = []
+    # de-dupe while preserving order (callers only ever use norm() of these,
+    # so which spelling of a duplicate survives doesn't matter)
+    return list({norm(n): n for n in names}.values())
+
+# Exact matching with a few common short->long aliases
+_AC_ALIASES = {
+    "uab": "university of alabama at birmingham",
+    "utsa": "university of texas at san antonio",
+    "usf": "south florida",
+    "fau": "florida atlantic",
+    "ecu": "east carolina",
+}
+# norm(short) -> norm(full), resolved once instead of per scraped name
+_AC_ALIAS_KEYS = {norm(short): norm(full) for short, full in _AC_ALIASES.items()}
+
+def get_ac_member_keys(pages: Optional[Dict[str, str]] = None) -> FrozenSet[str]:
+    raw = scrape_members_from_season(AC_SEASON_URL, pages)
+    keys = set()
     for n in raw:
-        expanded.append(n)
         k = norm(n)
-        for short, full in aliases.items():
-            if k == norm(short):
-                expanded.append(full)
-    keys = {norm(n) for n in expanded}
-    print(f"[AC] Season page teams: {len(keys)} -> {sorted(list(keys))}", file=sys.stderr)
-    return keys
-
-def get_sec_member_keys_from_season() -> Optional[Set[str]]:
+        keys.add(k)
+        if k in _AC_ALIAS_KEYS:
+            keys.add(_AC_ALIAS_KEYS[k])
+    if VERBOSE:
+        print(f"[AC] Season page teams: {len(keys)} -> {sorted(keys)}", file=sys.stderr)
+    return frozenset(keys)
+
+def get_sec_member_keys_from_season(pages: Optional[Dict[str, str]] = None) -> Optional[FrozenSet[str]]:
     try:
-        raw = scrape_members_from_season(SEC_SEASON_URL)
+        raw = scrape_members_from_season(SEC_SEASON_URL, pages)
         if not raw:
             return None
-        keys = {norm(n) for n in raw}
-        print(f"[SEC] Season page teams: {len(keys)} -> {sorted(list(keys))}", file=sys.stderr)
+        keys = frozenset(norm(n) for n in raw)
+        if VERBOSE:
+            print(f"[SEC] Season page teams: {len(keys)} -> {sorted(keys)}", file=sys.stderr)
         return keys
     except Exception as e:
         print(f"[SEC] Season page fallback triggered: {e}", file=sys.stderr)
@@ -220,14 +425,17 @@ def classify_conference_from_cell(raw_conf: str) -> Optional[str]:
     """Fallback classification from program table cells for SEC/Big Sky only."""
     if not raw_conf:
         return None
-    raw = raw_conf.strip()
-    key = re.sub(r"[^a-z]", "", raw.lower())
+    low = raw_conf.strip().lower()
+    # Most rows are other conferences; skip the regex work for them
+    if not any(h in low for h in _CONF_HINTS):
+        return None
+    key = _RE_NONALPHA.sub("", low)
 
     # Exclude Atlantic Coast (ACC) explicitly
-    if "atlanticcoast" in key or re.search(r"\bacc\b", raw.lower()):
+    if "atlanticcoast" in key or _RE_ACC.search(low):
         return None
 
-    if "southeasternconference" in key or re.search(r"\bsec\b", raw.lower()):
+    if "southeasternconference" in key or _RE_SEC.search(low):
         return "Southeastern Conference"
     if "bigskyconference" in key or "bigsky" in key:
         return "Big Sky Conference"
@@ -235,80 +443,69 @@ def classify_conference_from_cell(raw_conf: str) -> Optional[str]:
 
 # -------------------- NCAA record building --------------------
 
-def build_ncaa_records() -> List[Dict[str, str]]:
+def _make_ncaa_record(r: Dict[str, str], conference: str, subdivision: str) -> Dict[str, str]:
+    """Output record for one program-table row placed in the given conference."""
+    school = (r.get("school") or "").strip()
+    team = (r.get("team") or "").strip()
+    city, state = split_location(r)
+    return {
+        "league": "NCAA",
+        "name": f"{school} {team}".strip(),
+        "school": r.get("school", ""),
+        "team": r.get("team", ""),
+        "city": city, "state": state,
+        "conference": conference,
+        "conference_short": short_conf(conference),
+        "subdivision": subdivision,
+        "stadium": r.get("stadium", ""),
+        "first_season": r.get("first_season", ""),
+        "joined": r.get("joined", ""),
+        "url": r.get("link", ""),
+    }
+
+def build_ncaa_records(pages: Optional[Dict[str, str]] = None) -> List[Dict[str, str]]:
     out: List[Dict[str, str]] = []
 
     # FBS programs table (for SEC + to enrich AC)
-    fbs_soup = BeautifulSoup(fetch(FBS_URL), "html.parser")
+    fbs_soup = parse_page(FBS_URL, pages)
     fbs_tbl = find_wikitable_with_conference(fbs_soup)
     if not fbs_tbl:
         raise RuntimeError("Could not find FBS wikitable with a Conference column.")
     fbs_rows = parse_program_table(fbs_tbl)
 
     # AC membership (exact match)
-    ac_keys = get_ac_member_keys()
-    kept_ac = 0
+    ac_keys = get_ac_member_keys(pages)
 
     # SEC membership (prefer season page; fallback to FBS table parse)
-    sec_keys = get_sec_member_keys_from_season()
+    sec_keys = get_sec_member_keys_from_season(pages)
     if not sec_keys:
-        sec_keys = set()
-        for r in fbs_rows:
-            conf = classify_conference_from_cell(r.get("conference", ""))
-            if conf == "Southeastern Conference":
-                sec_keys.add(norm(r.get("school", "")))
-        print(f"[SEC] Fallback derived keys: {len(sec_keys)} -> {sorted(list(sec_keys))}", file=sys.stderr)
-    kept_sec = 0
+        sec_keys = frozenset(
+            r["_school_key"] for r in fbs_rows
+            if classify_conference_from_cell(r.get("conference", "")) == "Southeastern Conference"
+        )
+        if VERBOSE:
+            print(f"[SEC] Fallback derived keys: {len(sec_keys)} -> {sorted(sec_keys)}", file=sys.stderr)
+
+    # One key -> conference index over both memberships; SEC wins ties
+    sec, ac = "Southeastern Conference", "American Conference"
+    dispatch = {k: ac for k in ac_keys}
+    dispatch.update((k, sec) for k in sec_keys)
+    kept = {sec: 0, ac: 0}
 
     # Iterate FBS once; pick AC/SEC based on membership sets
     for r in fbs_rows:
-        school = r.get("school", "")
-        team = r.get("team", "")
-        city, state = split_location(r)
-        url = r.get("link", "")
-        school_k, team_k = norm(school), norm(team)
-
-        # SEC
-        if school_k in sec_keys or team_k in sec_keys:
-            out.append({
-                "league": "NCAA",
-                "name": f"{school} {team}".strip(),
-                "school": school,
-                "team": team,
-                "city": city, "state": state,
-                "conference": "Southeastern Conference",
-                "conference_short": short_conf("Southeastern Conference"),
-                "subdivision": "FBS",
-                "stadium": r.get("stadium", ""),
-                "first_season": r.get("first_season", ""),
-                "joined": r.get("joined", ""),
-                "url": url,
-            })
-            kept_sec += 1
+        by_school = dispatch.get(r["_school_key"])
+        by_team = dispatch.get(r["_team_key"])
+        conf = sec if sec in (by_school, by_team) else by_school or by_team
+        if not conf:
             continue
+        out.append(_make_ncaa_record(r, conf, "FBS"))
+        kept[conf] += 1
 
-        # AC
-        if school_k in ac_keys or team_k in ac_keys:
-            out.append({
-                "league": "NCAA",
-                "name": f"{school} {team}".strip(),
-                "school": school,
-                "team": team,
-                "city": city, "state": state,
-                "conference": "American Conference",
-                "conference_short": short_conf("American Conference"),
-                "subdivision": "FBS",
-                "stadium": r.get("stadium", ""),
-                "first_season": r.get("first_season", ""),
-                "joined": r.get("joined", ""),
-                "url": url,
-            })
-            kept_ac += 1
-
-    print(f"[FBS] Kept {kept_sec} SEC and {kept_ac} AC teams.", file=sys.stderr)
+    print(f"[FBS] Kept {kept[sec]} SEC and {kept[ac]} AC teams.", file=sys.stderr)
 
     # FCS programs table (for Big Sky)
-    fcs_soup = BeautifulSoup(fetch(FCS_URL), "html.parser")
+    fcs_soup = parse_page(FCS_URL, pages)
     fcs_tbl = find_wikitable_with_conference(fcs_soup)
     if not fcs_tbl:
         raise RuntimeError("Could not find FCS wikitable with a Conference column.")
@@ -319,21 +516,7 @@ def build_ncaa_records() -> List[Dict[str, str]]:
         conf_name = classify_conference_from_cell(r.get("conference", ""))
         if conf_name != "Big Sky Conference":
             continue
-        city, state = split_location(r)
-        out.append({
-            "league": "NCAA",
-            "name": f"{(r.get('school') or '').strip()} {(r.get('team') or '').strip()}".strip(),
-            "school": r.get("school", ""),
-            "team": r.get("team", ""),
-            "city": city, "state": state,
-            "conference": "Big Sky Conference",
-            "conference_short": short_conf("Big Sky Conference"),
-            "subdivision": "FCS",
-            "stadium": r.get("stadium", ""),
-            "first_season": r.get("first_season", ""),
-            "joined": r.get("joined", ""),
-            "url": r.get("link", ""),
-        })
+        out.append(_make_ncaa_record(r, "Big Sky Conference", "FCS"))
         kept_bigsky += 1
 
     print(f"[FCS] Kept {kept_bigsky} Big Sky teams.", file=sys.stderr)
@@ -351,130 +534,133 @@ def extract_first_src_from_srcset(srcset: str) -> Optional[str]:
     first = parts[0].split(" ")[0].strip()
     return first or None
 
-def build_nfl_records() -> List[Dict[str, str]]:
-    html = fetch(NFL_TEAMS_URL)
-    soup = BeautifulSoup(html, "html.parser")
+def build_nfl_records(pages: Optional[Dict[str, str]] = None) -> List[Dict[str, str]]:
+    soup = parse_page(NFL_TEAMS_URL, pages)
 
-    teams = []
-    promos = soup.select("div.nfl-c-custom-promo")
+    teams: Dict[str, Dict[str, str]] = {}  # url -> team; first card per URL wins
+    promos = css(soup, "div.nfl-c-custom-promo")
     if not promos:
         # fallback: newer layout sometimes nests in section
-        promos = soup.select("section a[href*='/teams/']")
+        promos = css(soup, "section a[href*='/teams/']")
 
     for promo in promos:
-        try:
-            # Name
-            name_tag = promo.select_one("h4 p") or promo.select_one("h4") or promo.select_one("p")
-            name = name_tag.get_text(strip=True) if name_tag else None
-
-            # Link
-            link_tag = promo.select_one("a[href*='/teams/']")
-            url = None
-            if link_tag and link_tag.get("href"):
-                href = link_tag["href"]
-                url = "https://www.nfl.com" + href if href.startswith("/") else href
-
-            # Logo (try <picture><source data-srcset> first; fallback to <img src>)
-            logo = None
-            src_tag = promo.select_one("picture source")
-            if src_tag:
-                logo = extract_first_src_from_srcset(src_tag.get("data-srcset") or src_tag.get("srcset") or "")
-            if not logo:
-                img_tag = promo.select_one("img")
-                if img_tag:
-                    logo = img_tag.get("data-src") or img_tag.get("src")
-
-            # Background image from style attribute
-            background = None
-            style = promo.get("style", "")
-            m = re.search(r"background-image:\s*url\(([^)]+)\)", style)
-            if m:
-                background = m.group(1)
-
-            # Only keep well-formed entries with a name and a teams link
-            if not (name and url and "/teams/" in url):
-                continue
-
-            teams.append({
-                "league": "NFL",
-                "name": name,
-                "url": url,
-                "logo": logo or "",
-                "background": background or "",
-            })
-        except Exception:
+        # Name: the <p> inside the headline, else the headline, else any <p>
+        heading = css_first(promo, "h4")
+        name_tag = (css_first(heading, "p") or heading) if heading else css_first(promo, "p")
+        name = node_text(name_tag) if name_tag else None
+
+        # Link
+        link_tag = css_first(promo, "a[href*='/teams/']")
+        url = None
+        href = attr(link_tag, "href") if link_tag else None
+        if href:
+            url = "https://www.nfl.com" + href if href.startswith("/") else href
+
+        # Logo (try <picture><source data-srcset> first; fallback to <img src>)
+        # One walk collects both candidates; they're told apart by tag
+        logo = None
+        media = css(promo, "picture source, img")
+        src_tag = next((n for n in media if tag_name(n) == "source"), None)
+        if src_tag:
+            logo = extract_first_src_from_srcset(attr(src_tag, "data-srcset") or attr(src_tag, "srcset") or "")
+        if not logo:
+            img_tag = next((n for n in media if tag_name(n) == "img"), None)
+            if img_tag:
+                logo = attr(img_tag, "data-src") or attr(img_tag, "src")
+
+        # Background image from style attribute
+        background = None
+        style = attr(promo, "style") or ""
+        m = _RE_BG_URL.search(style)
+        if m:
+            background = m.group(1)
+
+        # Only keep well-formed entries with a name and a teams link
+        if not (name and url and "/teams/" in url):
             continue
-
-    # Deduplicate by URL
-    seen, uniq = set(), []
-    for t in teams:
-        k = t["url"]
-        if k in seen:
+        if url in teams:
             continue
-        seen.add(k); uniq.append(t)
 
+        teams[url] = {
+            "league": "NFL",
+            "name": name,
+            "url": url,
+            "logo": logo or "",
+            "background": background or "",
+        }
+
+    uniq = list(teams.values())
     print(f"[NFL] Parsed {len(uniq)} teams.", file=sys.stderr)
     return uniq
 
 # -------------------- XML writer --------------------
 
-def write_xml(records_ncaa: List[Dict[str, str]], records_nfl: List[Dict[str, str]], out_path: str = "teams.xml") -> None:
-    root = Element("teams")
-
-    meta = SubElement(root, "meta")
-    SubElement(meta, "generated_by").text = "maker.py"
-    SubElement(meta, "source_fbs").text = FBS_URL
-    SubElement(meta, "source_fcs").text = FCS_URL
-    SubElement(meta, "source_ac").text = AC_SEASON_URL
-    SubElement(meta, "source_sec").text = SEC_SEASON_URL
-    SubElement(meta, "source_nfl").text = NFL_TEAMS_URL
-    SubElement(meta, "generated_at").text = time.strftime("%Y-%m-%dT%H:%M:%S")
-
-    def add(parent, tag, text):
-        el = SubElement(parent, tag); el.text = text or ""; return el
-
-    # NCAA teams
-    for r in records_ncaa:
-        team = SubElement(root, "team")
-        add(team, "league", r.get("league"))
-        add(team, "name", r.get("name"))
-        add(team, "school", r.get("school"))
-        add(team, "nickname", r.get("team"))
-        add(team, "city", r.get("city"))
-        add(team, "state", r.get("state"))
-        add(team, "conference", r.get("conference"))
-        add(team, "conference_short", r.get("conference_short"))
-        add(team, "subdivision", r.get("subdivision"))
-        add(team, "stadium", r.get("stadium"))
-        add(team, "first_season", r.get("first_season"))
-        add(team, "joined_conference", r.get("joined"))
-        add(team, "url", r.get("url"))
-
-    # NFL teams
-    for r in records_nfl:
-        team = SubElement(root, "team")
-        add(team, "league", r.get("league"))
-        add(team, "name", r.get("name"))
-        add(team, "url", r.get("url"))
-        add(team, "logo", r.get("logo"))
-        add(team, "background", r.get("background"))
-
-    # Pretty print (Python 3.9+)
-    try:
-        import xml.etree.ElementTree as ET
-        ET.indent(root, space="  ")
-    except Exception:
-        pass
+# (xml tag, record key) in output order
+_NCAA_XML_FIELDS = (
+    ("league", "league"), ("name", "name"), ("school", "school"), ("nickname", "team"),
+    ("city", "city"), ("state", "state"), ("conference", "conference"),
+    ("conference_short", "conference_short"), ("subdivision", "subdivision"),
+    ("stadium", "stadium"), ("first_season", "first_season"),
+    ("joined_conference", "joined"), ("url", "url"),
+)
+_NFL_XML_FIELDS = (
+    ("league", "league"), ("name", "name"), ("url", "url"), ("logo", "logo"), ("background", "background"),
+)
+
+def _emit(tag: str, text: Optional[str], indent: str) -> str:
+    """One element line, laid out the way ET.indent + ElementTree.write would."""
+    if not text:
+        return f"{indent}<{tag} />\n"
+    return f"{indent}<{tag}>{escape(text)}</{tag}>\n"
+
+def _emit_team(r: Dict[str, str], fields) -> str:
+    return "  <team>\n" + "".join(_emit(tag, r.get(key), "    ") for tag, key in fields) + "  </team>\n"
 
-    ElementTree(root).write(out_path, encoding="utf-8", xml_declaration=True)
+def write_xml(records_ncaa: List[Dict[str, str]], records_nfl: List[Dict[str, str]], out_path: str = "teams.xml") -> None:
+    # Streamed straight to disk one team at a time; no element tree is built
+    with open(out_path, "w", encoding="utf-8") as f:
+        f.write("<?xml version='1.0' encoding='utf-8'?>\n<teams>\n")
+
+        f.write("  <meta>\n")
+        f.write(_emit("generated_by", "maker.py", "    "))
+        f.write(_emit("source_fbs", FBS_URL, "    "))
+        f.write(_emit("source_fcs", FCS_URL, "    "))
+        f.write(_emit("source_ac", AC_SEASON_URL, "    "))
+        f.write(_emit("source_sec", SEC_SEASON_URL, "    "))
+        f.write(_emit("source_nfl", NFL_TEAMS_URL, "    "))
+        f.write(_emit("generated_at", time.strftime("%Y-%m-%dT%H:%M:%S"), "    "))
+        f.write("  </meta>\n")
+
+        # NCAA teams
+        for r in records_ncaa:
+            f.write(_emit_team(r, _NCAA_XML_FIELDS))
+
+        # NFL teams
+        for r in records_nfl:
+            f.write(_emit_team(r, _NFL_XML_FIELDS))
+
+        f.write("</teams>")
     print(f"Wrote {out_path} with {len(records_ncaa) + len(records_nfl)} total teams.", file=sys.stderr)
 
 # -------------------- main --------------------
 
 def main():
+    global VERBOSE
+    ap = argparse.ArgumentParser(description="Build a unified teams.xml (SEC, American Conference, Big Sky + NFL).")
+    ap.add_argument("--no-cache", action="store_true",
+                    help=f"Clear the page cache in {CACHE_DIR} and download everything fresh")
+    ap.add_argument("-v", "--verbose", action="store_true", help="Print the scraped membership keys")
+    args = ap.parse_args()
+    if args.verbose:
+        VERBOSE = True
+    if args.no_cache:
+        clear_cache()
+
     try:
-        ncaa = build_ncaa_records()
-        nfl = build_nfl_records()
+        # All five pages are independent; download them at once up front
+        pages = fetch_all(ALL_URLS)
+        ncaa = build_ncaa_records(pages)
+        nfl = build_nfl_records(pages)
         write_xml(ncaa, nfl, "teams.xml")
     except requests.HTTPError as e:
         print(f"HTTP error: {e}", file=sys.stderr); sys.exit(1)